@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from streamlit.testing.v1 import AppTest
+
+UIS = {
+    "langgraph": Path(__file__).resolve().parent / "ui_streamlit.py",
+    "retail": Path(__file__).resolve().parent.parent / "retail_agent" / "ui_streamlit.py",
+}
+
+
+def make_history(n: int) -> List[BaseMessage]:
+    """Synthetic conversation of human / tool-calling AI / tool / AI turns."""
+    payload = json.dumps({"rows": [{"sku": f"SKU-{i:03d}", "revenue": i * 12.5} for i in range(60)]})
+    cycle = [
+        lambda i: HumanMessage(content=f"Question {i}: summarize last week's sales."),
+        lambda i: AIMessage(content="", tool_calls=[{"name": "calculator", "args": {"expression": "1+1"}, "id": f"call_{i}"}]),
+        lambda i: ToolMessage(content=payload, name="calculator", tool_call_id=f"call_{i}"),
+        lambda i: AIMessage(content=f"**Final Answer:** result {i}\n\n- point one\n- point two"),
+    ]
+    return [cycle[i % len(cycle)](i) for i in range(n)]
+
+
+def time_rerun(ui: Path, n: int, show_all: bool, runs: int) -> float:
+    """Median wall time (ms) of one script rerun with `n` messages in session state."""
+    messages = make_history(n)
+    at = AppTest.from_file(str(ui), default_timeout=60)
+    at.session_state["app"] = object()  # never invoked: no prompt is submitted
+    at.session_state["model"] = "bench"
+    at.session_state["temperature"] = 0.0
+    at.session_state["show_tools"] = True
+    at.session_state["messages"] = messages
+    at.session_state["saved_count"] = n
+    at.session_state["show_earlier"] = show_all
+    at.query_params["thread"] = "bench"
+    at.run()
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        at.run()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-rerun render time of the Streamlit UIs")
+    parser.add_argument("--ui", choices=sorted(UIS), default="langgraph")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["CHECKPOINT_DB"] = str(Path(tmp) / "bench.sqlite")
+        results: List[Dict] = []
+        for n in args.sizes:
+            results.append({
+                "messages": n,
+                "full_history_ms": round(time_rerun(UIS[args.ui], n, True, args.runs), 1),
+                "windowed_ms": round(time_rerun(UIS[args.ui], n, False, args.runs), 1),
+            })
+    print(json.dumps({"ui": args.ui, "results": results}, indent=2))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+
+_DEFAULT_DB = Path(__file__).parent / "data" / "checkpoints.sqlite"
+
+
+class CheckpointConflict(Exception):
+    """Another writer already stored messages at the sequence numbers being saved."""
+
+
+class MessageCheckpointer:
+    """SQLite-backed store for `MessagesState` history, keyed by thread id.
+
+    Each message is one row, so saving a turn only inserts the messages added
+    since the last save instead of rewriting the whole conversation. Writes
+    are append-only: rows are only deleted by an explicit `clear`.
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path or os.getenv("CHECKPOINT_DB") or _DEFAULT_DB)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS messages ("
+                " thread_id TEXT NOT NULL,"
+                " seq INTEGER NOT NULL,"
+                " payload TEXT NOT NULL,"
+                " PRIMARY KEY (thread_id, seq))"
+            )
+
+    def count(self, thread_id: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM messages WHERE thread_id = ?", (thread_id,)
+            ).fetchone()
+        return int(row[0])
+
+    def load(self, thread_id: str) -> List[BaseMessage]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT payload FROM messages WHERE thread_id = ? ORDER BY seq", (thread_id,)
+            ).fetchall()
+        return messages_from_dict([json.loads(r[0]) for r in rows])
+
+    def save(self, thread_id: str, messages: Sequence[BaseMessage], start: int) -> int:
+        """Append `messages[start:]` after `start` stored messages.
+
+        Returns the number of rows written. Raises `CheckpointConflict` (and
+        writes nothing) if any of those sequence numbers is already taken,
+        e.g. by another browser tab on the same thread.
+        """
+        delta = [
+            (thread_id, seq, json.dumps(message_to_dict(m)))
+            for seq, m in enumerate(messages[start:], start)
+        ]
+        try:
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT INTO messages (thread_id, seq, payload) VALUES (?, ?, ?)", delta
+                )
+        except sqlite3.IntegrityError as e:
+            raise CheckpointConflict(f"thread {thread_id!r} already has messages at seq >= {start}") from e
+        return len(delta)
+
+    def sync(self, thread_id: str, messages: Sequence[BaseMessage], saved: int,
+             retries: int = 5) -> Tuple[List[BaseMessage], int]:
+        """Save `messages[saved:]`, merging with concurrent writers on conflict.
+
+        On a conflict the thread is reloaded and the unsaved messages are
+        appended after what is stored. Returns (history, saved count) for the
+        caller to keep.
+        """
+        pending = list(messages[saved:])
+        history = list(messages)
+        for _ in range(retries):
+            try:
+                self.save(thread_id, history, saved)
+                return history, len(history)
+            except CheckpointConflict:
+                stored = self.load(thread_id)
+                history, saved = stored + pending, len(stored)
+        raise CheckpointConflict(f"thread {thread_id!r} kept changing; gave up after {retries} retries")
+
+    def clear(self, thread_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM messages WHERE thread_id = ?", (thread_id,))
+
+
+__all__ = ["CheckpointConflict", "MessageCheckpointer"]
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+def canonical_json(params_json: str) -> str:
+    """Canonical form of a tool's JSON input, so equivalent requests share a key."""
+    try:
+        return json.dumps(json.loads(params_json or "{}"), sort_keys=True, separators=(",", ":"))
+    except (json.JSONDecodeError, TypeError):
+        return str(params_json)
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one computation.
+
+    The first caller for a key runs `fn`; callers arriving while it is in
+    flight wait for the same result (or exception) instead of recomputing.
+    Nothing is cached once the call finishes. Thread and asyncio callers
+    share the same in-flight table, so results returned to several callers
+    must be treated as read-only.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._stats = {"calls": 0, "executions": 0, "coalesced": 0}
+
+    def _join(self, key: Hashable):
+        """Return (future, is_leader) for `key`, registering a new call if none is in flight."""
+        with self._lock:
+            self._stats["calls"] += 1
+            fut = self._inflight.get(key)
+            if fut is not None:
+                self._stats["coalesced"] += 1
+                return fut, False
+            fut = Future()
+            self._inflight[key] = fut
+            self._stats["executions"] += 1
+            return fut, True
+
+    def _run(self, key: Hashable, fut: Future, fn: Callable[..., T], args, kwargs) -> None:
+        try:
+            fut.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            fut.set_exception(e)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def do(self, key: Hashable, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run `fn(*args, **kwargs)` once per in-flight `key` and return its result."""
+        if not self.enabled:
+            return fn(*args, **kwargs)
+        fut, leader = self._join(key)
+        if leader:
+            self._run(key, fut, fn, args, kwargs)
+        return fut.result()
+
+    async def do_async(self, key: Hashable, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Asyncio variant of `do`; `fn` is blocking and runs in a worker thread."""
+        if not self.enabled:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+        fut, leader = self._join(key)
+        if leader:
+            await asyncio.to_thread(self._run, key, fut, fn, args, kwargs)
+        return await asyncio.wrap_future(fut)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "inflight": len(self._inflight)}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats = dict.fromkeys(self._stats, 0)
+
+
+__all__ = ["SingleFlight", "canonical_json"]
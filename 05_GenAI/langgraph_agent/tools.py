@@ -6,7 +6,18 @@ from pathlib import Path
 from typing import Any, Dict, List
 
 import json
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool, tool
+
+from singleflight import SingleFlight
+
+# Concurrent identical FAQ loads and lookups share one computation. The
+# calculator is cheaper than the coalescing bookkeeping, so it is not wrapped.
+_flight = SingleFlight()
+
+
+def single_flight_stats() -> Dict[str, int]:
+    """Coalescing counters for the FAQ loader and lookup tool."""
+    return _flight.stats()
 
 
 # ----------------------- Calculator (safe) -----------------------
@@ -73,6 +84,10 @@ _FAQ_PATH = Path(__file__).parent / "data" / "faq.json"
 
 
 def _load_faq() -> List[Dict[str, Any]]:
+    return _flight.do(("load", str(_FAQ_PATH)), _read_faq)
+
+
+def _read_faq() -> List[Dict[str, Any]]:
     if not _FAQ_PATH.exists():
         return []
     with open(_FAQ_PATH, "r", encoding="utf-8") as f:
@@ -89,8 +104,12 @@ def _score(query: str, text: str) -> float:
     return inter / len(q)
 
 
-@tool("faq_lookup")
-def faq_lookup(question: str) -> str:
+def _faq_key(question: str):
+    # Scoring is case- and whitespace-insensitive, so normalized questions share a key.
+    return ("faq_lookup", " ".join(question.lower().split()))
+
+
+def _faq_lookup(question: str) -> str:
     """Answer from a curated FAQ knowledge base. Input should be a short question.
 
     Returns an answer with a brief rationale and the matched question when available.
@@ -110,5 +129,22 @@ def faq_lookup(question: str) -> str:
     return "No good match found in FAQ. Try rephrasing or provide more context."
 
 
+def _coalesced_faq_lookup(question: str) -> str:
+    return _flight.do(_faq_key(question), _faq_lookup, question)
+
+
+async def _acoalesced_faq_lookup(question: str) -> str:
+    # Asyncio callers share the in-flight lookup without holding an executor thread.
+    return await _flight.do_async(_faq_key(question), _faq_lookup, question)
+
+
+faq_lookup = StructuredTool.from_function(
+    func=_coalesced_faq_lookup,
+    coroutine=_acoalesced_faq_lookup,
+    name="faq_lookup",
+    description=_faq_lookup.__doc__,
+)
+
+
 __all__ = ["calculator", "faq_lookup"]
 
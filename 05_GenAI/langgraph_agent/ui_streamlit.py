@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+import uuid
 from typing import List
 
 import streamlit as st
@@ -8,6 +9,12 @@ from dotenv import load_dotenv, find_dotenv
 from langchain_core.messages import AIMessage, HumanMessage, ToolMessage, BaseMessage
 
 from agent import build_agent
+from checkpoint import MessageCheckpointer
+
+# Only the most recent messages are rendered on every rerun; older ones are
+# behind a toggle so rerun cost stays flat as the conversation grows.
+HISTORY_WINDOW = 20
+TOOL_PREVIEW_CHARS = 400
 
 
 def init_env():
@@ -15,6 +22,19 @@ def init_env():
     return os.getenv("OPENAI_API_KEY"), os.getenv("LLM_MODEL", "gpt-4o-mini")
 
 
+@st.cache_resource
+def get_checkpointer() -> MessageCheckpointer:
+    return MessageCheckpointer()
+
+
+def get_thread_id() -> str:
+    thread_id = st.query_params.get("thread")
+    if not thread_id:
+        thread_id = uuid.uuid4().hex
+        st.query_params["thread"] = thread_id
+    return thread_id
+
+
 def get_role(msg: BaseMessage) -> str:
     if msg.type == "human":
         return "user"
@@ -40,13 +60,28 @@ def render_message(msg: BaseMessage, show_tools: bool = True):
         return
     if isinstance(msg, ToolMessage) and show_tools:
         with st.chat_message(role):
-            st.caption(f"Tool `{msg.name}` result:")
-            st.code(content)
+            text = str(content)
+            with st.expander(f"Tool `{msg.name}` result ({len(text)} chars)", expanded=False):
+                if len(text) > TOOL_PREVIEW_CHARS:
+                    st.code(text[:TOOL_PREVIEW_CHARS] + " …")
+                    st.caption("Payload truncated for display.")
+                else:
+                    st.code(text)
         return
     with st.chat_message(role):
         st.markdown(content or "")
 
 
+def render_history(messages: List[BaseMessage], show_tools: bool = True):
+    older = len(messages) - HISTORY_WINDOW
+    if older > 0:
+        if st.toggle(f"Show {older} earlier messages", key="show_earlier"):
+            for msg in messages[:older]:
+                render_message(msg, show_tools=show_tools)
+    for msg in messages[max(older, 0):]:
+        render_message(msg, show_tools=show_tools)
+
+
 def main():
     st.set_page_config(page_title="LangGraph Agent", page_icon="🤖", layout="wide")
     st.title("LangGraph Agentic Chat")
@@ -66,6 +101,10 @@ def main():
             st.session_state["model"] = model
             st.session_state["temperature"] = temperature
             st.session_state["show_tools"] = show_tools
+            # Drop the old thread's checkpoint so resets don't leave orphaned history
+            if st.query_params.get("thread"):
+                get_checkpointer().clear(st.query_params["thread"])
+            st.query_params.clear()
             st.experimental_rerun()
 
         st.markdown("---")
@@ -81,22 +120,30 @@ def main():
         st.session_state["show_tools"] = show_tools
     if "app" not in st.session_state:
         st.session_state["app"] = build_agent(model=st.session_state["model"], temperature=st.session_state["temperature"])
+    checkpointer = get_checkpointer()
+    thread_id = get_thread_id()
     if "messages" not in st.session_state:
-        st.session_state["messages"] = []  # type: List[BaseMessage]
+        st.session_state["messages"] = checkpointer.load(thread_id)  # type: List[BaseMessage]
+        st.session_state["saved_count"] = len(st.session_state["messages"])
 
     # Render chat history
-    for msg in st.session_state["messages"]:
-        render_message(msg, show_tools=st.session_state["show_tools"])
+    render_history(st.session_state["messages"], show_tools=st.session_state["show_tools"])
 
     # User input
     prompt = st.chat_input("Ask a question…")
     if prompt:
         st.session_state["messages"].append(HumanMessage(content=prompt))
         render_message(st.session_state["messages"][-1])
+        st.session_state["messages"], st.session_state["saved_count"] = checkpointer.sync(
+            thread_id, st.session_state["messages"], st.session_state["saved_count"]
+        )
 
         state = {"messages": st.session_state["messages"]}
         state = st.session_state["app"].invoke(state)
         st.session_state["messages"] = state["messages"]
+        st.session_state["messages"], st.session_state["saved_count"] = checkpointer.sync(
+            thread_id, st.session_state["messages"], st.session_state["saved_count"]
+        )
 
         # Render only the new messages after the user input
         # Find the last AI message to display succinctly
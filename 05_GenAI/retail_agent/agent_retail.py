@@ -10,6 +10,7 @@ from langgraph.graph import END, StateGraph
 from langgraph.graph.message import MessagesState
 from langgraph.prebuilt import ToolNode, tools_condition
 
+from .prewarm_retail import retail_standard_report
 from .tools_retail import (
     retail_inventory_status,
     retail_markdown_report,
@@ -22,6 +23,7 @@ def build_retail_agent(model: str = "gpt-4o-mini", temperature: float = 0.0):
     """Retail agent with planning and tool use.
 
     Tools available:
+      - retail_standard_report
       - retail_sales_summary
       - retail_inventory_status
       - retail_price_optimize
@@ -29,6 +31,7 @@ def build_retail_agent(model: str = "gpt-4o-mini", temperature: float = 0.0):
     """
 
     tools = [
+        retail_standard_report,
         retail_sales_summary,
         retail_inventory_status,
         retail_price_optimize,
@@ -37,7 +40,8 @@ def build_retail_agent(model: str = "gpt-4o-mini", temperature: float = 0.0):
 
     system = (
         "You are a senior retail analytics assistant. \n"
-        "When asked for a business summary, first gather facts using tools (sales, inventory),"
+        "For the routine daily business summary, call retail_standard_report (pre-built from current data). \n"
+        "For other business summaries, first gather facts using tools (sales, inventory),"
         " optionally run price optimization, then produce a concise markdown report. \n"
         "Cite which tools were used and ensure a 'Final Answer:' section.")
 
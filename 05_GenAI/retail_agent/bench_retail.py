@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+try:
+    from . import prewarm_retail, tools_retail
+except Exception:
+    # Fallback for direct execution
+    pkg_dir = Path(__file__).resolve().parent
+    parent_dir = pkg_dir.parent
+    if str(parent_dir) not in sys.path:
+        sys.path.insert(0, str(parent_dir))
+    from retail_agent import prewarm_retail, tools_retail
+
+
+def make_sales_csv(path: Path, rows: int, days: int = 365, skus: int = 200, seed: int = 7,
+                   missing_frac: float = 0.0) -> Path:
+    """Write a synthetic sales.csv with the same columns as data/sales.csv.
+
+    `missing_frac` blanks that fraction of date/order_id/sku/category cells.
+    """
+    rng = np.random.default_rng(seed)
+    sku_ids = rng.integers(1, skus + 1, rows)
+    categories = np.array(["Apparel", "Electronics", "Home", "Beauty", "Grocery"])
+    df = pd.DataFrame({
+        "date": pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, days, rows), unit="D"),
+        "order_id": np.arange(1, rows + 1),
+        "sku": [f"SKU-{i:03d}" for i in sku_ids],
+        "category": categories[sku_ids % len(categories)],
+        "unit_price": np.round(5 + (sku_ids % 50) * 3.99, 2),
+        "quantity": rng.integers(1, 6, rows),
+    })
+    for col in ("date", "order_id", "sku", "category"):
+        df[col] = df[col].astype(object).mask(rng.random(rows) < missing_frac)
+    df.sort_values("date").to_csv(path, index=False)
+    return path
+
+
+def _same(a, b, rel: float = 1e-9) -> bool:
+    """Structural equality with a relative tolerance on floats."""
+    if isinstance(a, float) or isinstance(b, float):
+        return isinstance(a, (int, float)) and isinstance(b, (int, float)) and math.isclose(a, b, rel_tol=rel, abs_tol=1e-9)
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_same(a[k], b[k], rel) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_same(x, y, rel) for x, y in zip(a, b))
+    return a == b
+
+
+def _groupby_summary(df: pd.DataFrame, spec: Dict) -> Dict:
+    """Reference: the original filter + groupby/nunique summary, every group, keyed by name."""
+    if spec.get("start"):
+        df = df[df["date"] >= pd.Timestamp(spec["start"])]
+    if spec.get("end"):
+        df = df[df["date"] <= pd.Timestamp(spec["end"])]
+    groups = {}
+    for key in ("sku", "category"):
+        g = df.groupby([key], as_index=False)[["revenue", "quantity"]].sum()
+        groups[key] = {r[key]: (float(r["revenue"]), int(r["quantity"])) for r in g.to_dict(orient="records")}
+    return {
+        "totals": {"orders": int(df["order_id"].nunique()), "units": int(df["quantity"].sum()), "revenue": float(df["revenue"].sum())},
+        **groups,
+    }
+
+
+def _matches_groupby(result: Dict, ref: Dict) -> bool:
+    mine = {
+        "totals": result["totals"],
+        "sku": {r["sku"]: (r["revenue"], r["quantity"]) for r in result["top_skus"]},
+        "category": {r["category"]: (r["revenue"], r["quantity"]) for r in result["top_categories"]},
+    }
+    tuples_to_lists = lambda d: {k: list(v) for k, v in d.items()}
+    return (_same(mine["totals"], ref["totals"])
+            and _same(tuples_to_lists(mine["sku"]), tuples_to_lists(ref["sku"]))
+            and _same(tuples_to_lists(mine["category"]), tuples_to_lists(ref["category"])))
+
+
+def make_specs(count: int, days: int = 365) -> List[Dict]:
+    """Weekly, monthly and quarterly (start, end, top_n) specs, cycled up to `count`."""
+    base = pd.Timestamp("2025-01-01")
+    specs = []
+    for width in (7, 30, 91):
+        for offset in range(0, days - width + 1, 7):
+            start = base + pd.Timedelta(days=offset)
+            end = start + pd.Timedelta(days=width - 1)
+            specs.append({"start": f"{start:%Y-%m-%d}", "end": f"{end:%Y-%m-%d}", "top_n": 5 + offset % 3})
+    return (specs * (count // len(specs) + 1))[:count]
+
+
+def bench_sales_batch(rows: int, count: int, missing_frac: float = 0.01) -> Dict:
+    """Time `count` individual retail_sales_summary calls against one batch call.
+
+    Also checks that batch results equal the single-call results, and that a
+    sample of all-groups specs matches a plain pandas groupby on the same
+    data (including rows with missing keys or dates, and open-ended ranges).
+    """
+    specs = make_specs(count)
+    with tempfile.TemporaryDirectory() as tmp:
+        tools_retail.SALES_CSV = make_sales_csv(Path(tmp) / "sales.csv", rows, missing_frac=missing_frac)
+
+        t0 = time.perf_counter()
+        single = [json.loads(tools_retail.retail_sales_summary.invoke(json.dumps(s))) for s in specs]
+        t_single = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        batch = json.loads(tools_retail.retail_sales_summary_batch.invoke(json.dumps({"specs": specs})))["results"]
+        t_batch = time.perf_counter() - t0
+
+        ref_specs = [{**s, "top_n": 10_000} for s in specs[::max(1, count // 20)]]
+        ref_specs += [{"start": ref_specs[0]["start"], "top_n": 10_000},
+                      {"end": ref_specs[0]["end"], "top_n": 10_000},
+                      {"top_n": 10_000}]
+        ref_results = json.loads(tools_retail.retail_sales_summary_batch.invoke(json.dumps({"specs": ref_specs})))["results"]
+        df = tools_retail._read_sales()
+        matches_groupby = all(_matches_groupby(r, _groupby_summary(df, s)) for r, s in zip(ref_results, ref_specs))
+
+    return {
+        "rows": rows,
+        "specs": count,
+        "individual_s": round(t_single, 3),
+        "batch_s": round(t_batch, 3),
+        "speedup": round(t_single / t_batch, 1),
+        "missing_frac": missing_frac,
+        "batch_matches_single": len(single) == len(batch) and all(_same(a, b) for a, b in zip(single, batch)),
+        "matches_groupby": matches_groupby,
+    }
+
+
+def _burst_calls(sessions: int):
+    """One dashboard refresh: every session asks for the same summary and pricing."""
+    summary = json.dumps({"start": "2025-03-01", "end": "2025-05-31", "top_n": 5})
+    pricing = json.dumps({"elasticity": -1.2})
+    return [(tools_retail.retail_sales_summary, summary), (tools_retail.retail_price_optimize, pricing)] * sessions
+
+
+def _thread_burst(sessions: int) -> None:
+    calls = _burst_calls(sessions)
+    barrier = threading.Barrier(len(calls))
+
+    def call(item):
+        barrier.wait()
+        fn, arg = item
+        return fn.invoke(arg)
+
+    with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+        list(pool.map(call, calls))
+
+
+def _async_burst(sessions: int) -> None:
+    async def run():
+        await asyncio.gather(*(fn.ainvoke(arg) for fn, arg in _burst_calls(sessions)))
+    asyncio.run(run())
+
+
+def bench_single_flight(rows: int, sessions: int, bursts: int) -> Dict:
+    """CPU and wall time per burst of identical concurrent tool calls, coalesced vs. not."""
+    out = {"rows": rows, "sessions": sessions, "bursts": bursts}
+    with tempfile.TemporaryDirectory() as tmp:
+        tools_retail.SALES_CSV = make_sales_csv(Path(tmp) / "sales.csv", rows)
+        for mode, burst in (("threads", _thread_burst), ("asyncio", _async_burst)):
+            for enabled in (False, True):
+                tools_retail._flight.enabled = enabled
+                tools_retail._flight.reset_stats()
+                cpu0, wall0 = time.process_time(), time.perf_counter()
+                for _ in range(bursts):
+                    burst(sessions)
+                cpu, wall = time.process_time() - cpu0, time.perf_counter() - wall0
+                out[f"{mode}_{'coalesced' if enabled else 'baseline'}"] = {
+                    "cpu_s_per_burst": round(cpu / bursts, 3),
+                    "wall_s_per_burst": round(wall / bursts, 3),
+                    **tools_retail.single_flight_stats(),
+                }
+    tools_retail._flight.enabled = True
+    return out
+
+
+def _standard_summary_request_path() -> str:
+    """What the agent runs for the daily summary without pre-warming."""
+    defn = prewarm_retail.ReportDefinition("daily")
+    findings: Dict = {}
+    findings.update(json.loads(tools_retail.retail_sales_summary.invoke(json.dumps(defn.sales))))
+    findings.update(json.loads(tools_retail.retail_inventory_status.invoke("")))
+    findings.update(json.loads(tools_retail.retail_price_optimize.invoke(json.dumps(defn.pricing))))
+    return tools_retail.retail_markdown_report.invoke(json.dumps(findings))
+
+
+def _median_ms(fn, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return round(float(np.median(samples)), 2)
+
+
+def _wait_fresh(scheduler, name: str = "daily", timeout: float = 120.0) -> None:
+    """Block until report `name` is fresh; fail with its build error instead of hanging."""
+    deadline = time.monotonic() + timeout
+    while scheduler.status()[name]["stale"]:
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"report {name!r} still stale after {timeout}s: {scheduler.status()[name]['error']}")
+        time.sleep(0.01)
+
+
+def bench_prewarm(rows: int, runs: int) -> Dict:
+    """End-user latency of the standard daily summary, computed live vs. served from a snapshot."""
+    out: Dict = {"rows": rows, "runs": runs}
+    with tempfile.TemporaryDirectory() as tmp:
+        sales = make_sales_csv(Path(tmp) / "sales.csv", rows)
+        tools_retail.SALES_CSV = sales
+        out["before_tool_chain_ms"] = _median_ms(_standard_summary_request_path, runs)
+
+        scheduler = prewarm_retail.start_prewarm(poll_interval=0.1)
+        _wait_fresh(scheduler)
+        out["after_standard_report_ms"] = _median_ms(lambda: prewarm_retail.retail_standard_report.invoke(""), runs)
+        out["after_tool_chain_ms"] = _median_ms(_standard_summary_request_path, runs)
+        out["build_ms"] = scheduler.status()["daily"]["build_ms"]
+
+        # Data change: the snapshot is stale until the scheduler rebuilds it.
+        t0 = time.perf_counter()
+        make_sales_csv(sales, rows, seed=8)
+        out["stale_after_change"] = scheduler.status()["daily"]["stale"]
+        _wait_fresh(scheduler)
+        out["rebuild_after_change_s"] = round(time.perf_counter() - t0, 2)
+        scheduler.stop()
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Retail tool benchmarks")
+    sub = parser.add_subparsers(dest="bench", required=True)
+    p = sub.add_parser("sales-batch", help="batched vs. individual retail_sales_summary")
+    p.add_argument("--rows", type=int, default=100_000)
+    p.add_argument("--specs", type=int, default=500)
+    p.add_argument("--missing-frac", type=float, default=0.01)
+    p = sub.add_parser("single-flight", help="identical concurrent tool calls with/without coalescing")
+    p.add_argument("--rows", type=int, default=100_000)
+    p.add_argument("--sessions", type=int, default=50)
+    p.add_argument("--bursts", type=int, default=3)
+    p = sub.add_parser("prewarm", help="standard summary latency with/without pre-warmed snapshots")
+    p.add_argument("--rows", type=int, default=100_000)
+    p.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.bench == "sales-batch":
+        print(json.dumps(bench_sales_batch(args.rows, args.specs, args.missing_frac), indent=2))
+    elif args.bench == "single-flight":
+        print(json.dumps(bench_single_flight(args.rows, args.sessions, args.bursts), indent=2))
+    elif args.bench == "prewarm":
+        print(json.dumps(bench_prewarm(args.rows, args.runs), indent=2))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.tools import tool
+
+try:
+    from . import tools_retail
+except Exception:
+    # Fallback for direct execution
+    import sys
+    pkg_dir = Path(__file__).resolve().parent
+    parent_dir = pkg_dir.parent
+    if str(parent_dir) not in sys.path:
+        sys.path.insert(0, str(parent_dir))
+    from retail_agent import tools_retail
+
+from langgraph_agent.singleflight import SingleFlight
+
+# Concurrent live builds of the same standard report share one computation.
+_flight = SingleFlight()
+
+
+@dataclass
+class ReportDefinition:
+    """A standard report: the tool inputs it needs, rebuilt whenever the data changes."""
+
+    name: str
+    sales: Dict[str, Any] = field(default_factory=lambda: {"top_n": 5})
+    pricing: Dict[str, Any] = field(default_factory=lambda: {"elasticity": -1.2})
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "ReportDefinition":
+        """Validate one definition; raises ValueError/TypeError on malformed input."""
+        if not isinstance(d, dict):
+            raise TypeError(f"definition must be an object, got {type(d).__name__}")
+        defn = cls(**d)
+        if not isinstance(defn.name, str) or not defn.name:
+            raise ValueError("'name' must be a non-empty string")
+        for key in ("sales", "pricing"):
+            if not isinstance(getattr(defn, key), dict):
+                raise TypeError(f"'{key}' must be an object")
+        return defn
+
+
+DEFAULT_REPORTS = [ReportDefinition("daily")]
+
+
+def load_report_definitions(value: Optional[str] = None) -> Tuple[List[ReportDefinition], Dict[str, str]]:
+    """Parse report definitions from `value` or the `RETAIL_REPORTS` env var.
+
+    The value is a JSON list of definitions, or a path to a file holding
+    one. Returns (definitions, errors). Invalid entries are skipped and
+    reported under their name (or index). An unreadable config falls back to
+    DEFAULT_REPORTS and is reported under "RETAIL_REPORTS".
+    """
+    value = (value or os.getenv("RETAIL_REPORTS") or "").strip()
+    if not value:
+        return list(DEFAULT_REPORTS), {}
+    try:
+        if value[0] in "[{":
+            raw = json.loads(value)
+        else:
+            with open(value, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        if not isinstance(raw, list):
+            raise TypeError("expected a JSON list of report definitions")
+    except (OSError, ValueError, TypeError) as e:
+        return list(DEFAULT_REPORTS), {"RETAIL_REPORTS": f"{type(e).__name__}: {e}"}
+
+    reports: List[ReportDefinition] = []
+    errors: Dict[str, str] = {}
+    for i, d in enumerate(raw):
+        try:
+            reports.append(ReportDefinition.from_dict(d))
+        except (TypeError, ValueError) as e:
+            label = d.get("name") if isinstance(d, dict) and isinstance(d.get("name"), str) else f"#{i}"
+            errors[label] = f"{type(e).__name__}: {e}"
+    return reports, errors
+
+
+@dataclass
+class ReportSnapshot:
+    name: str
+    version: int
+    data_version: Tuple
+    built_at: float
+    build_ms: float
+    markdown: str
+
+
+def build_report(defn: ReportDefinition) -> Tuple[str, Dict[Tuple[str, str], str]]:
+    """Run the standard tool chain for `defn`; returns (markdown, tool outputs by snapshot key)."""
+    outputs = tools_retail.compute_tool_outputs([
+        ("retail_sales_summary", json.dumps(defn.sales)),
+        ("retail_inventory_status", ""),
+        ("retail_price_optimize", json.dumps(defn.pricing)),
+    ])
+    findings: Dict[str, Any] = {}
+    for out in outputs.values():
+        findings.update(json.loads(out))
+    return tools_retail.retail_markdown_report.invoke(json.dumps(findings)), outputs
+
+
+class PrewarmScheduler:
+    """Watch the retail CSVs and rebuild standard reports off the request path.
+
+    A daemon thread polls `tools_retail.data_version()`. When the data
+    changes it rebuilds every report, publishes the underlying tool outputs
+    through `tools_retail.publish_snapshot`, and keeps the markdown as a
+    versioned `ReportSnapshot`. A snapshot is served only while its data
+    version is still current; otherwise callers compute live. Reports that
+    fail to build stay stale and are retried on the next poll.
+    """
+
+    def __init__(self, reports: Optional[List[ReportDefinition]] = None, poll_interval: float = 2.0):
+        if reports is None:
+            reports, self._config_errors = load_report_definitions()
+        else:
+            self._config_errors = {}
+        self.reports = {r.name: r for r in reports}
+        self.poll_interval = poll_interval
+        self._snapshots: Dict[str, ReportSnapshot] = {}
+        self._errors: Dict[str, str] = {}
+        self._version = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "PrewarmScheduler":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="retail-prewarm", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.poll_interval)
+
+    def refresh(self, force: bool = False) -> None:
+        """Rebuild reports not yet built from the current data (all of them if `force`)."""
+        version = tools_retail.data_version()
+        pending = [
+            (name, defn) for name, defn in self.reports.items()
+            if force or name not in self._snapshots or self._snapshots[name].data_version != version
+        ]
+        if not pending:
+            return
+        self._version += 1
+        for name, defn in pending:
+            t0 = time.perf_counter()
+            try:
+                markdown, outputs = build_report(defn)
+            except Exception as e:
+                self._errors[name] = f"{type(e).__name__}: {e}"
+                continue
+            tools_retail.publish_snapshot(outputs, version)
+            self._snapshots[name] = ReportSnapshot(
+                name=name,
+                version=self._version,
+                data_version=version,
+                built_at=time.time(),
+                build_ms=(time.perf_counter() - t0) * 1000,
+                markdown=markdown,
+            )
+            self._errors.pop(name, None)
+
+    def snapshot(self, name: str) -> Optional[ReportSnapshot]:
+        """The latest snapshot for `name` if it was built from the current data, else None."""
+        snap = self._snapshots.get(name)
+        if snap is not None and snap.data_version == tools_retail.data_version():
+            return snap
+        return None
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Per-report version, age and staleness (data changed since the last build).
+
+        Invalid definitions from RETAIL_REPORTS are listed as stale with their error.
+        """
+        current = tools_retail.data_version()
+        out = {
+            name: {"version": None, "age_s": None, "build_ms": None, "stale": True, "error": error}
+            for name, error in self._config_errors.items()
+        }
+        for name in self.reports:
+            snap = self._snapshots.get(name)
+            out[name] = {
+                "version": snap.version if snap else None,
+                "age_s": round(time.time() - snap.built_at, 1) if snap else None,
+                "build_ms": round(snap.build_ms, 1) if snap else None,
+                "stale": snap is None or snap.data_version != current,
+                "error": self._errors.get(name),
+            }
+        return out
+
+
+_scheduler: Optional[PrewarmScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def start_prewarm(reports: Optional[List[ReportDefinition]] = None, poll_interval: float = 2.0) -> PrewarmScheduler:
+    """Start (once per process) and return the shared pre-warm scheduler."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = PrewarmScheduler(reports, poll_interval)
+        return _scheduler.start()
+
+
+@tool("retail_standard_report")
+def retail_standard_report(params_json: str = "") -> str:
+    """Return a standard pre-built business summary report (sales, inventory, pricing) as markdown.
+    Input JSON: {"name": "daily"} (optional). Prefer this for the routine daily summary.
+    An unknown name returns {"error": "unknown_report", "available": [...]}.
+    """
+    try:
+        params = json.loads(params_json or "{}")
+    except json.JSONDecodeError:
+        params = {}
+    requested = params.get("name") if isinstance(params, dict) else None
+    name = requested or "daily"
+    snap = _scheduler.snapshot(name) if _scheduler is not None else None
+    if snap is not None:
+        age = time.time() - snap.built_at
+        return f"{snap.markdown}\n\n_Snapshot v{snap.version}, built {age:.0f}s ago from current data._"
+    reports = _scheduler.reports if _scheduler is not None else {r.name: r for r in load_report_definitions()[0]}
+    defn = reports.get(name)
+    if defn is None:
+        if requested:
+            return json.dumps({"error": "unknown_report", "name": requested, "available": sorted(reports)})
+        defn = ReportDefinition(name)  # no name given: the built-in daily report
+    markdown, _ = _flight.do(("retail_standard_report", name), build_report, defn)
+    return f"{markdown}\n\n_Computed live (no fresh snapshot)._"
+
+
+__all__ = [
+    "ReportDefinition",
+    "PrewarmScheduler",
+    "start_prewarm",
+    "retail_standard_report",
+]
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import os
+import uuid
+from pathlib import Path
 from typing import List
 
 import streamlit as st
@@ -9,15 +11,24 @@ from langchain_core.messages import AIMessage, HumanMessage, ToolMessage, BaseMe
 
 try:
     from .agent_retail import build_retail_agent
+    from .prewarm_retail import start_prewarm
 except Exception:
     # Fallback for direct execution
     import sys
-    from pathlib import Path
     pkg_dir = Path(__file__).resolve().parent
     parent_dir = pkg_dir.parent
     if str(parent_dir) not in sys.path:
         sys.path.insert(0, str(parent_dir))
     from retail_agent.agent_retail import build_retail_agent
+    from retail_agent.prewarm_retail import start_prewarm
+
+# Shared with the langgraph_agent UI; importable once 05_GenAI is on sys.path.
+from langgraph_agent.checkpoint import MessageCheckpointer
+
+CHECKPOINT_DB = Path(__file__).resolve().parent / "data" / "checkpoints.sqlite"
+# Older messages stay behind a toggle so each rerun renders a bounded window.
+HISTORY_WINDOW = 20
+TOOL_PREVIEW_CHARS = 400
 
 
 def init_env():
@@ -25,6 +36,45 @@ def init_env():
     return os.getenv("OPENAI_API_KEY"), os.getenv("LLM_MODEL", "gpt-4o-mini")
 
 
+@st.cache_resource
+def get_checkpointer() -> MessageCheckpointer:
+    return MessageCheckpointer(os.getenv("CHECKPOINT_DB") or CHECKPOINT_DB)
+
+
+@st.cache_resource
+def get_prewarm():
+    # One background scheduler per server process, shared by all sessions
+    return start_prewarm()
+
+
+def get_thread_id() -> str:
+    thread_id = st.query_params.get("thread")
+    if not thread_id:
+        thread_id = uuid.uuid4().hex
+        st.query_params["thread"] = thread_id
+    return thread_id
+
+
+def render_message(m: BaseMessage):
+    with st.chat_message("assistant" if m.type != "human" else "user"):
+        content = getattr(m, "content", "")
+        if isinstance(m, ToolMessage):
+            text = str(content)
+            with st.expander(f"Tool `{m.name}` result ({len(text)} chars)", expanded=False):
+                st.code(text if len(text) <= TOOL_PREVIEW_CHARS else text[:TOOL_PREVIEW_CHARS] + " …")
+        else:
+            st.markdown(content)
+
+
+def render_history(messages: List[BaseMessage]):
+    older = len(messages) - HISTORY_WINDOW
+    if older > 0 and st.toggle(f"Show {older} earlier messages", key="show_earlier"):
+        for m in messages[:older]:
+            render_message(m)
+    for m in messages[max(older, 0):]:
+        render_message(m)
+
+
 def main():
     st.set_page_config(page_title="Retail Analyst Agent", page_icon="🛒", layout="wide")
     st.title("Retail Analyst Agent")
@@ -45,9 +95,19 @@ def main():
             st.session_state.clear()
             st.session_state["model"] = model
             st.session_state["temperature"] = temperature
+            # Drop the old thread's checkpoint so resets don't leave orphaned history
+            if st.query_params.get("thread"):
+                get_checkpointer().clear(st.query_params["thread"])
+            st.query_params.clear()
             # Correct API: rerun the app after changing settings
             st.experimental_rerun()
 
+        st.markdown("---")
+        st.caption("Pre-built reports")
+        for name, info in get_prewarm().status().items():
+            state = "stale" if info["stale"] else f"v{info['version']}, {info['age_s']}s old"
+            st.caption(f"{name}: {state}" + (f" (error: {info['error']})" if info["error"] else ""))
+
         st.markdown("---")
         st.caption("Env Info")
         st.code(f"MODEL={model}\nTEMP={temperature}\nAPI_KEY={'set' if api_key else 'missing'}")
@@ -72,13 +132,14 @@ def main():
     # Init agent and history
     if "app" not in st.session_state:
         st.session_state["app"] = build_retail_agent(model=model, temperature=temperature)
+    checkpointer = get_checkpointer()
+    thread_id = get_thread_id()
     if "messages" not in st.session_state:
-        st.session_state["messages"] = []  # type: List[BaseMessage]
+        st.session_state["messages"] = checkpointer.load(thread_id)  # type: List[BaseMessage]
+        st.session_state["saved_count"] = len(st.session_state["messages"])
 
     # Render past
-    for m in st.session_state["messages"]:
-        with st.chat_message("assistant" if m.type != "human" else "user"):
-            st.markdown(getattr(m, "content", ""))
+    render_history(st.session_state["messages"])
 
     # Input
     prompt = st.chat_input("Ask for a retail analysis or report…")
@@ -86,10 +147,16 @@ def main():
         st.session_state["messages"].append(HumanMessage(content=prompt))
         with st.chat_message("user"):
             st.markdown(prompt)
+        st.session_state["messages"], st.session_state["saved_count"] = checkpointer.sync(
+            thread_id, st.session_state["messages"], st.session_state["saved_count"]
+        )
 
         state = {"messages": st.session_state["messages"]}
         state = st.session_state["app"].invoke(state)
         st.session_state["messages"] = state["messages"]
+        st.session_state["messages"], st.session_state["saved_count"] = checkpointer.sync(
+            thread_id, st.session_state["messages"], st.session_state["saved_count"]
+        )
         # Show the latest AI message
         for m in reversed(st.session_state["messages"]):
             if isinstance(m, AIMessage):